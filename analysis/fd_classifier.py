@@ -1,3 +1,10 @@
+# Kernel object schemes as they appear before ':' in /proc/<pid>/fd targets
+_SCHEME_TYPES = {
+    "socket": "Socket",
+    "pipe": "Pipe",
+}
+
+
 def classify_fd(target, fd_number=None):
     """
     Classify a file descriptor using Linux OS semantics.
@@ -11,23 +18,23 @@ def classify_fd(target, fd_number=None):
     # -----------------------------
     # STANDARD FILE DESCRIPTORS
     # -----------------------------
-    if fd_number in (0, 1, 2):
+    if fd_number is not None and 0 <= fd_number <= 2:
         return "Standard"
 
     # -----------------------------
-    # KERNEL-MANAGED RESOURCES
+    # REGULAR FILES
     # -----------------------------
-    if target.startswith("socket:"):
-        return "Socket"
-
-    if target.startswith("pipe:"):
-        return "Pipe"
+    # Checked first on the leading character: paths are the most common
+    # targets and must not be split on a ':' that appears in a filename.
+    if target[:1] == "/":
+        return "File"
 
     # -----------------------------
-    # REGULAR FILES
+    # KERNEL-MANAGED RESOURCES
     # -----------------------------
-    if target.startswith("/"):
-        return "File"
+    scheme, sep, _ = target.partition(":")
+    if sep:
+        return _SCHEME_TYPES.get(scheme, "Other")
 
     # -----------------------------
     # OTHER / UNKNOWN
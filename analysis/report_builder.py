@@ -1,4 +1,7 @@
+from bisect import bisect_right
 from collections import Counter
+from operator import itemgetter
+from typing import Optional
 from analysis.fd_classifier import classify_fd
 
 FD_DANGER_RANK = {
@@ -17,26 +20,57 @@ FD_DANGER_REASON = {
     "Socket": "Sockets maintain kernel networking state, buffers, and remote connections, making leaks highly dangerous."
 }
 
-def analyze_fds(fd_entries, soft_limit):
-    report = []
-    types = []
-    non_standard = 0
-
-    for entry in fd_entries:
-        fd_type = classify_fd(entry["target"], entry["fd"])
-        types.append(fd_type)
-
-        if fd_type != "Standard":
-            non_standard += 1
-
-        report.append({
-            "FD": entry["fd"],
-            "Target": entry["target"],
-            "Type": fd_type
-        })
+# Severity tiers: (severity, severity_reason, severity_condition)
+SEVERITY_CRITICAL = (
+    "CRITICAL",
+    "FD usage is extremely high and approaches the configured per-process limit.",
+    "FD usage percentage ≥ 90% of the soft limit."
+)
+
+SEVERITY_HIGH = (
+    "HIGH",
+    "FD usage is significantly elevated relative to the allowed limit.",
+    "FD usage percentage between 70% and 90% of the soft limit."
+)
+
+SEVERITY_MEDIUM = (
+    "MEDIUM",
+    "The absolute number of open file descriptors is high compared to typical processes.",
+    "Total open file descriptors ≥ 200, regardless of percentage."
+)
+
+SEVERITY_LOW = (
+    "LOW",
+    "The process maintains a controlled number of file descriptors.",
+    "Total open file descriptors < 200 and usage well within limits."
+)
+
+# Upper bounds (exclusive) of each footprint bucket; one message per bucket
+FD_FOOTPRINT_THRESHOLDS = (50, 100, 150, 200)
+
+FD_FOOTPRINT_MESSAGES = (
+    "The process has a very small file descriptor footprint, typical of short-lived or idle programs.",
+    "The process shows low file descriptor usage, common for lightweight background services.",
+    "The file descriptor usage is moderate and consistent with normal file and IPC activity.",
+    "The process maintains a moderately high number of file descriptors, indicating sustained kernel interaction.",
+    "The process exhibits very high file descriptor usage, typical of browsers, IDEs, or core services."
+)
+
+# Column extractors for read_fds()-style {"fd", "target"} entries
+_get_fd = itemgetter("fd")
+_get_target = itemgetter("target")
+
+def analyze_fds(fd_entries, soft_limit: Optional[int]):
+    # -----------------------------
+    # Columnar Classification
+    # -----------------------------
+    fds = list(map(_get_fd, fd_entries))
+    targets = list(map(_get_target, fd_entries))
+    types = list(map(classify_fd, targets, fds))
 
     type_counts = Counter(types)
     total = len(fd_entries)
+    non_standard = total - type_counts["Standard"]
 
     # -----------------------------
     # FD Density (Kernel Intensity)
@@ -47,57 +81,30 @@ def analyze_fds(fd_entries, soft_limit):
     # FD Usage vs Soft Limit
     # -----------------------------
     usage_pct = None
-    if isinstance(soft_limit, int) and soft_limit > 0:
+    if soft_limit and soft_limit > 0:
         usage_pct = (total / soft_limit) * 100
 
     # -----------------------------
     # Severity Classification
     # -----------------------------
     if usage_pct is not None and usage_pct >= 90:
-        severity = "CRITICAL"
-        severity_reason = "FD usage is extremely high and approaches the configured per-process limit."
-        severity_condition = "FD usage percentage ≥ 90% of the soft limit."
+        severity, severity_reason, severity_condition = SEVERITY_CRITICAL
 
     elif usage_pct is not None and usage_pct >= 70:
-        severity = "HIGH"
-        severity_reason = "FD usage is significantly elevated relative to the allowed limit."
-        severity_condition = "FD usage percentage between 70% and 90% of the soft limit."
+        severity, severity_reason, severity_condition = SEVERITY_HIGH
 
     elif total >= 200:
-        severity = "MEDIUM"
-        severity_reason = "The absolute number of open file descriptors is high compared to typical processes."
-        severity_condition = "Total open file descriptors ≥ 200, regardless of percentage."
+        severity, severity_reason, severity_condition = SEVERITY_MEDIUM
 
     else:
-        severity = "LOW"
-        severity_reason = "The process maintains a controlled number of file descriptors."
-        severity_condition = "Total open file descriptors < 200 and usage well within limits."
+        severity, severity_reason, severity_condition = SEVERITY_LOW
 
     # -----------------------------
     # Range-Based Interpretation
     # -----------------------------
     analysis = []
 
-    if total < 50:
-        analysis.append(
-            "The process has a very small file descriptor footprint, typical of short-lived or idle programs."
-        )
-    elif total < 100:
-        analysis.append(
-            "The process shows low file descriptor usage, common for lightweight background services."
-        )
-    elif total < 150:
-        analysis.append(
-            "The file descriptor usage is moderate and consistent with normal file and IPC activity."
-        )
-    elif total < 200:
-        analysis.append(
-            "The process maintains a moderately high number of file descriptors, indicating sustained kernel interaction."
-        )
-    else:
-        analysis.append(
-            "The process exhibits very high file descriptor usage, typical of browsers, IDEs, or core services."
-        )
+    analysis.append(FD_FOOTPRINT_MESSAGES[bisect_right(FD_FOOTPRINT_THRESHOLDS, total)])
 
     analysis.append(
         f"{non_standard} out of {total} descriptors are non-standard and correspond to kernel-managed resources."
@@ -112,7 +119,7 @@ def analyze_fds(fd_entries, soft_limit):
     )
 
     return {
-        "table": report,
+        "table_columns": {"FD": fds, "Target": targets, "Type": types},
         "type_counts": type_counts,
         "non_standard": non_standard,
         "severity": severity,
@@ -1,3 +1,4 @@
+import io
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -30,20 +31,28 @@ st.caption(f"Snapshot captured at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 # -----------------------------
 # LOAD PROCESS SNAPSHOT
 # -----------------------------
-@st.cache_data(show_spinner=False)
+PROCESS_SNAPSHOT_TTL_SEC = 5.0
+FD_SNAPSHOT_TTL_SEC = 2.0
+
+@st.cache_data(ttl=PROCESS_SNAPSHOT_TTL_SEC, show_spinner=False)
 def get_process_snapshot():
-    return pd.DataFrame(list_processes())
+    df = pd.DataFrame(list_processes())
+    top5 = df.nlargest(5, "fd_count")[["pid", "name", "fd_count"]]
+    bottom5 = df.nsmallest(5, "fd_count")[["pid", "name", "fd_count"]]
+    pid_labels = {pid: f"{pid} — {name}" for pid, name in zip(df["pid"].tolist(), df["name"].tolist())}
+    return df, top5, bottom5, pid_labels
+
+@st.cache_data(ttl=FD_SNAPSHOT_TTL_SEC, max_entries=64, show_spinner=False)
+def get_fd_snapshot(pid):
+    return read_fds(pid), get_fd_limits(pid)
 
-proc_df = get_process_snapshot()
+proc_df, top5, bottom5, pid_labels = get_process_snapshot()
 
 # -----------------------------
 # SYSTEM OVERVIEW
 # -----------------------------
 st.markdown("## FD Usage Snapshot (System Overview)")
 
-top5 = proc_df.sort_values("fd_count", ascending=False).head(5)[["pid", "name", "fd_count"]]
-bottom5 = proc_df.sort_values("fd_count", ascending=True).head(5)[["pid", "name", "fd_count"]]
-
 c1, c2 = st.columns(2)
 with c1:
     st.markdown("### Top 5 FD-Heavy Processes")
@@ -56,17 +65,17 @@ with c2:
 # -----------------------------
 # PROCESS SELECTION
 # -----------------------------
-if "selected_pid" not in st.session_state:
-    st.session_state.selected_pid = int(proc_df.iloc[0]["pid"])
+pid_list = list(pid_labels)
 
-pid_list = proc_df["pid"].tolist()
-name_map = dict(zip(proc_df["pid"], proc_df["name"]))
+# Snapshot refreshes may drop a process that has since exited
+if st.session_state.get("selected_pid") not in pid_list:
+    st.session_state.selected_pid = int(proc_df.iloc[0]["pid"])
 
 selected_pid = st.selectbox(
     "Select Process for Forensic Analysis",
     pid_list,
     index=pid_list.index(st.session_state.selected_pid),
-    format_func=lambda p: f"{p} — {name_map[p]}"
+    format_func=pid_labels.__getitem__
 )
 
 st.session_state.selected_pid = selected_pid
@@ -74,8 +83,7 @@ st.session_state.selected_pid = selected_pid
 # -----------------------------
 # FD ANALYSIS
 # -----------------------------
-fds = read_fds(selected_pid)
-soft, hard = get_fd_limits(selected_pid)
+fds, (soft, hard) = get_fd_snapshot(selected_pid)
 soft_limit = int(soft) if soft.isdigit() else None
 
 result = analyze_fds(fds, soft_limit)
@@ -118,10 +126,10 @@ color_map = {
     "Socket": "#cc0000"
 }
 
-colors = [color_map.get(l, "#cccccc") for l in labels]
-
-left, center, right = st.columns([1, 2, 1])
-with center:
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_donut_png(labels, sizes):
+    """Render the FD type donut once per distinct (labels, sizes) as PNG bytes."""
+    colors = [color_map.get(l, "#cccccc") for l in labels]
     fig, ax = plt.subplots(figsize=(3.2, 3.2), dpi=120)
     ax.pie(
         sizes,
@@ -133,7 +141,14 @@ with center:
     )
     ax.set_aspect("equal")
     ax.set_title("FD Type Distribution by Leak Risk", fontsize=10)
-    st.pyplot(fig)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+left, center, right = st.columns([1, 2, 1])
+with center:
+    st.image(render_donut_png(tuple(labels), tuple(sizes)))
 
 # -----------------------------
 # FORENSIC INTERPRETATION
@@ -161,4 +176,4 @@ st.markdown(
 # FD TABLE
 # -----------------------------
 st.markdown("## File Descriptor Table")
-st.dataframe(pd.DataFrame(result["table"]), use_container_width=True)
+st.dataframe(pd.DataFrame(result["table_columns"]), use_container_width=True)
@@ -6,8 +6,12 @@ Produces deterministic, technical summaries for systems/security engineers.
 import json
 import logging
 import os
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import re
+import threading
+import time
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -15,9 +19,54 @@ logger = logging.getLogger(__name__)
 # Project root (backend/ai -> backend -> project root)
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
+# Long alphanumeric/underscore strings (likely keys) to redact from error messages
+_KEY_RE = re.compile(r"[A-Za-z0-9_-]{20,}")
+
+# Model names to try in order. prefer flash-lite for quota, then flash.
+_MODEL_NAMES = (
+    "gemini-2.0-flash-lite",
+    "gemini-2.0-flash",
+    "gemini-2.5-flash",
+    "gemini-flash-latest",
+    "gemini-exp-1206",
+)
+
+# fd_growth longer than PROMPT_MAX_GROWTH_SAMPLES is reduced to PROMPT_GROWTH_SAMPLES for the prompt
+PROMPT_MAX_GROWTH_SAMPLES = 128
+PROMPT_GROWTH_SAMPLES = 64
+
+# LOW-severity, normally terminated runs whose FD count varies by less than this
+# get a templated summary instead of a Gemini request
+BENIGN_MAX_FD_SPREAD = 5
+
+# Each generate_content request is bounded by this; the SDK aborts the call itself
+GEMINI_REQUEST_TIMEOUT_SEC = 20.0
+
+# After GEMINI_BREAKER_FAILURES consecutive network failures or timeouts, Gemini is
+# skipped for GEMINI_BREAKER_COOLDOWN_SEC (locally answered benign reports are unaffected)
+GEMINI_BREAKER_FAILURES = 3
+GEMINI_BREAKER_COOLDOWN_SEC = 60.0
+
+_env_loaded = False
+
+# genai.configure() is process-global and GenerativeModel binds the default client
+# on its first generate_content(), so a key stays configured for as long as any
+# request is using it; a request with another key waits until those finish.
+_configured_key: Optional[str] = None
+_configured_key_users = 0
+_configure_cond = threading.Condition()
+
+_breaker_lock = threading.Lock()
+_breaker_fail_count = 0
+_breaker_open_until = 0.0
+
 
 def _ensure_env_loaded() -> None:
     """Load .env from project root so GEMINI_API_KEY is available regardless of cwd."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
     try:
         from dotenv import load_dotenv
         env_path = _PROJECT_ROOT / ".env"
@@ -27,13 +76,36 @@ def _ensure_env_loaded() -> None:
         pass
 
 
+def _downsample_growth(fd_growth: list) -> list:
+    """
+    Reduce a long fd_growth series to PROMPT_GROWTH_SAMPLES evenly spaced samples.
+    Real samples are kept (no interpolation); the first, last and peak samples always survive.
+    """
+    n = len(fd_growth)
+    if n <= PROMPT_MAX_GROWTH_SAMPLES:
+        return fd_growth
+    step = (n - 1) / (PROMPT_GROWTH_SAMPLES - 1)
+    keep = {round(i * step) for i in range(PROMPT_GROWTH_SAMPLES)}
+    keep.add(max(range(n), key=lambda i: fd_growth[i].get("fd_count", 0)))
+    return [fd_growth[i] for i in sorted(keep)]
+
+
 def _build_prompt(report: dict) -> str:
     """Build a strict forensic prompt; response must use exact section headers, max 250 words."""
     language = report.get("execution", {}).get("language", "python")
+    fd_growth = report.get("fd_growth") or []
+    sampled_growth = _downsample_growth(fd_growth)
+    growth_note = ""
+    if len(sampled_growth) < len(fd_growth):
+        report = {**report, "fd_growth": sampled_growth}
+        growth_note = (
+            f"\nNOTE: fd_growth was down-sampled from {len(fd_growth)} to {len(sampled_growth)} "
+            "evenly spaced samples (first, last and peak samples kept); judge the pattern, not the sample density.\n"
+        )
     return f"""You are a senior systems/security engineer performing file descriptor forensics. Respond using EXACTLY the four section headers below. No filler, no generic advice, no repetition. Maximum 250 words.
-
+{growth_note}
 REPORT (JSON):
-{json.dumps(report, indent=2)}
+{json.dumps(report, separators=(",", ":"))}
 
 Use exactly these headers and requirements:
 
@@ -58,40 +130,137 @@ Use exactly these headers and requirements:
 """
 
 
+def _benign_summary(report: dict) -> Optional[str]:
+    """
+    Return a templated summary for runs with nothing for the model to explain:
+    normal exit, LOW severity and a flat FD count. Returns None otherwise.
+    """
+    execution = report.get("execution") or {}
+    fd_analysis = report.get("fd_analysis") or {}
+    fd_growth = report.get("fd_growth") or []
+    if execution.get("termination_reason") != "normal" or fd_analysis.get("severity") != "LOW" or not fd_growth:
+        return None
+    counts = [s.get("fd_count", 0) for s in fd_growth]
+    lo, hi = min(counts), max(counts)
+    if hi - lo >= BENIGN_MAX_FD_SPREAD:
+        return None
+
+    language = "C" if execution.get("language") == "c" else "Python"
+    type_counts = fd_analysis.get("type_counts") or {}
+    total = sum(type_counts.values())
+    dominant = max(type_counts, key=type_counts.get) if type_counts else "Standard"
+    first, last = fd_growth[0], fd_growth[-1]
+    return f"""### FD Forensic Summary
+- Language: {language}
+- Termination: normal
+- Max FD count observed: {hi}
+- FD growth pattern: plateau ({lo}–{hi} FDs across {len(fd_growth)} samples)
+
+### Risk Assessment
+- Expected behavior: Yes; the FD count stayed flat and the process exited normally.
+- Leak likelihood: Low
+- Dominant FD type: {dominant} ({type_counts.get(dominant, 0)} of {total} in the final snapshot)
+
+### Evidence
+- fd_growth: {first.get("fd_count")} FDs at t={first.get("time_sec")}s, {last.get("fd_count")} FDs at t={last.get("time_sec")}s
+- Final snapshot: {fd_analysis.get("non_standard", 0)} non-standard of {total} descriptors; severity LOW
+
+### Actionable Recommendations
+- No leak: descriptors did not accumulate during execution, so no fix is required.
+- Summary generated locally for this low-risk run; Gemini was not called."""
+
+
 def _sanitize_error_message(msg: str) -> str:
     """Remove any substring that could be an API key; never expose keys."""
     if not msg:
         return ""
     # Replace long alphanumeric/underscore strings (likely keys) with [REDACTED]
-    out = re.sub(r"[A-Za-z0-9_-]{20,}", "[REDACTED]", msg)
+    out = _KEY_RE.sub("[REDACTED]", msg)
     return out.strip()[:200]
 
 
+# (pattern, error_code, fallback detail) checked in order against the lowercased
+# error message; the first match wins, so more specific causes come first.
+_ERROR_RULES = (
+    (re.compile(r"not valid|api key|invalid(?=.*key)|key(?=.*invalid)", re.S),
+     "invalid_key", "API key rejected by Google."),
+    (re.compile(r"400|bad request"), "invalid_key", "Bad request (often invalid API key)."),
+    (re.compile(r"403|permission|forbidden"), "invalid_key", "Permission denied."),
+    (re.compile(r"429|quota|rate limit|resource exhausted"), "quota", "Rate limit exceeded."),
+    (re.compile(r"blocked|safety|harm"), "blocked", "Response blocked."),
+    (re.compile(r"network|connection|timeout|timed out|deadline"), "network", "Network or timeout error."),
+    (re.compile(r"404|not found(?=.*model)|model(?=.*not found)", re.S),
+     "model_error", "Model not found. Please check API availability."),
+)
+
+
 def _classify_error(exc: Exception) -> Tuple[str, str]:
     """Return (error_code, sanitized_detail). Never include key in detail."""
     msg = (str(exc) or "").lower()
     detail = _sanitize_error_message(str(exc) or "")
-    if "not valid" in msg or ("invalid" in msg and "key" in msg) or "api key" in msg:
-        return ("invalid_key", detail or "API key rejected by Google.")
-    if "400" in msg or "bad request" in msg:
-        return ("invalid_key", detail or "Bad request (often invalid API key).")
-    if "403" in msg or "permission" in msg or "forbidden" in msg:
-        return ("invalid_key", detail or "Permission denied.")
-    if "429" in msg or "quota" in msg or "rate limit" in msg or "resource exhausted" in msg:
-        return ("quota", detail or "Rate limit exceeded.")
-    if "blocked" in msg or "safety" in msg or "harm" in msg:
-        return ("blocked", detail or "Response blocked.")
-    if "network" in msg or "connection" in msg or "timeout" in msg or "timed out" in msg:
-        return ("network", detail or "Network or timeout error.")
-    if "404" in msg or "not found" in msg and ("model" in msg or "generateContent" in msg):
-<<<<<<< HEAD
-        return ("invalid_key", detail or "Model not found for this API. Try again; the app will use a supported model.")
-=======
-        return ("model_error", detail or "Model not found. Please check API availability.")
->>>>>>> 5daa7d3 (Gemini fix)
+    for pattern, code, fallback in _ERROR_RULES:
+        if pattern.search(msg):
+            return (code, detail or fallback)
     return ("unknown", detail)
 
 
+def _breaker_is_open() -> bool:
+    with _breaker_lock:
+        return time.monotonic() < _breaker_open_until
+
+
+def _breaker_record(error_code: Optional[str]) -> None:
+    """Count consecutive network failures; any other outcome closes the breaker again."""
+    global _breaker_fail_count, _breaker_open_until
+    with _breaker_lock:
+        if error_code != "network":
+            _breaker_fail_count = 0
+            return
+        _breaker_fail_count += 1
+        if _breaker_fail_count >= GEMINI_BREAKER_FAILURES:
+            logger.warning(
+                "Gemini failed %s times in a row; skipping it for %ss",
+                _breaker_fail_count, GEMINI_BREAKER_COOLDOWN_SEC,
+            )
+            _breaker_open_until = time.monotonic() + GEMINI_BREAKER_COOLDOWN_SEC
+            _breaker_fail_count = 0
+
+
+@lru_cache(maxsize=8)
+def _get_model(model_name: str):
+    """Return a GenerativeModel handle for the currently configured key."""
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(model_name)
+
+
+@contextmanager
+def _configured(api_key: str):
+    """
+    Hold genai configured for api_key for the duration of the block.
+    Requests sharing a key run concurrently; a different key waits for them,
+    then reconfigures and drops the model handles bound to the old key.
+    """
+    global _configured_key, _configured_key_users
+    with _configure_cond:
+        while _configured_key_users and api_key != _configured_key:
+            _configure_cond.wait()
+        if api_key != _configured_key:
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            _get_model.cache_clear()
+            _configured_key = api_key
+        _configured_key_users += 1
+    try:
+        yield
+    finally:
+        with _configure_cond:
+            _configured_key_users -= 1
+            if not _configured_key_users:
+                _configure_cond.notify_all()
+
+
 def summarize_fd_report(report: dict, api_key: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Send the FD execution report to Gemini.
@@ -105,64 +274,63 @@ def summarize_fd_report(report: dict, api_key: Optional[str] = None) -> Tuple[Op
         logger.debug("GEMINI_API_KEY NOT SET")
         return (None, None, None)
 
-    # Model names that support generateContent (try in order if one 404s)
-<<<<<<< HEAD
-    model_names = ["gemini-2.0-flash", "gemini-1.5-flash-latest", "gemini-1.5-flash", "gemini-pro"]
-=======
-    # Model names to try in order. prefer flash for speed/cost, then pro.
-    # Model names to try in order. prefer flash-lite for quota, then flash.
-    model_names = [
-        "gemini-2.0-flash-lite",
-        "gemini-2.0-flash",
-        "gemini-2.5-flash",
-        "gemini-flash-latest",
-        "gemini-exp-1206",
-    ]
->>>>>>> 5daa7d3 (Gemini fix)
+    benign = _benign_summary(report)
+    if benign is not None:
+        logger.debug("Benign report; skipping Gemini request")
+        return (benign, None, None)
 
+    if _breaker_is_open():
+        return (None, "network", "Gemini is temporarily unreachable; skipped after repeated failures.")
+
+    result = _request_summary(report, api_key)
+    _breaker_record(result[1])
+    return result
+
+
+def _request_summary(report: dict, api_key: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """One Gemini round (model fallback loop); returns summarize_fd_report's tuple."""
     try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        prompt = _build_prompt(report)
-        config = {"temperature": 0.2, "max_output_tokens": 512, "top_p": 0.95}
-        last_error: Optional[Exception] = None
-
-        for model_name in model_names:
-            try:
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt, generation_config=config)
-                text = getattr(response, "text", None)
-                if text is not None:
-                    return (str(text).strip(), None, None)
-                if response.candidates and response.candidates[0].content.parts:
-                    part = response.candidates[0].content.parts[0]
-                    text = getattr(part, "text", None)
-                    if text:
+        with _configured(api_key):
+            prompt = _build_prompt(report)
+            config = {"temperature": 0.2, "max_output_tokens": 512, "top_p": 0.95}
+            last_error: Optional[Exception] = None
+
+            for model_name in _MODEL_NAMES:
+                try:
+                    model = _get_model(model_name)
+                    response = model.generate_content(
+                        prompt,
+                        generation_config=config,
+                        request_options={"timeout": GEMINI_REQUEST_TIMEOUT_SEC},
+                    )
+                    text = getattr(response, "text", None)
+                    if text is not None:
                         return (str(text).strip(), None, None)
-                if response.candidates and response.candidates[0].finish_reason:
-                    reason = str(response.candidates[0].finish_reason or "").lower()
-                    if "safety" in reason or "block" in reason or "recitation" in reason:
-                        return (None, "blocked", "Response was blocked by the model.")
-                logger.warning("Gemini returned no text")
-                return (None, "unknown", "Model returned no text.")
-            except Exception as e:
-                last_error = e
-                err_msg = (str(e) or "").lower()
-                if "404" in err_msg or "not found" in err_msg:
-                    logger.debug("Model %s not available, trying next: %s", model_name, e)
-                    continue
-<<<<<<< HEAD
-=======
-                if "429" in err_msg or "quota" in err_msg or "resource exhausted" in err_msg:
-                    logger.debug("Model %s quota exceeded, trying next: %s", model_name, e)
-                    continue
->>>>>>> 5daa7d3 (Gemini fix)
-                raise
-
-        if last_error is not None:
-            raise last_error
-        return (None, "unknown", "Model returned no text.")
+                    if response.candidates and response.candidates[0].content.parts:
+                        part = response.candidates[0].content.parts[0]
+                        text = getattr(part, "text", None)
+                        if text:
+                            return (str(text).strip(), None, None)
+                    if response.candidates and response.candidates[0].finish_reason:
+                        reason = str(response.candidates[0].finish_reason or "").lower()
+                        if "safety" in reason or "block" in reason or "recitation" in reason:
+                            return (None, "blocked", "Response was blocked by the model.")
+                    logger.warning("Gemini returned no text")
+                    return (None, "unknown", "Model returned no text.")
+                except Exception as e:
+                    last_error = e
+                    err_msg = (str(e) or "").lower()
+                    if "404" in err_msg or "not found" in err_msg:
+                        logger.debug("Model %s not available, trying next: %s", model_name, e)
+                        continue
+                    if "429" in err_msg or "quota" in err_msg or "resource exhausted" in err_msg:
+                        logger.debug("Model %s quota exceeded, trying next: %s", model_name, e)
+                        continue
+                    raise
+
+            if last_error is not None:
+                raise last_error
+            return (None, "unknown", "Model returned no text.")
     except Exception as e:
         logger.warning("Gemini API request failed: %s", e)
         code, detail = _classify_error(e)
@@ -4,12 +4,18 @@ Executes a Python file in a subprocess with timeout and RLIMIT_NOFILE.
 Samples FD count over time and captures final FD snapshot.
 """
 
+import hashlib
 import logging
 import os
+import re
 import resource
+import selectors
+import shutil
 import signal
 import subprocess
+import tempfile
 import threading
+from collections import OrderedDict
 import time
 from datetime import datetime, timezone
 from typing import Optional
@@ -21,136 +27,250 @@ DEFAULT_TIMEOUT_SEC = 30
 DEFAULT_FD_LIMIT = 256
 FD_SAMPLE_INTERVAL_SEC = 0.1
 FD_LIMIT_VIOLATION_INDICATORS = ("too many open files", "emfile", "errno 24")
+# All indicators in one case-insensitive pass; no lowercased copy of the output
+_FD_LIMIT_VIOLATION_RE = re.compile(
+    "|".join(map(re.escape, FD_LIMIT_VIOLATION_INDICATORS)), re.IGNORECASE
+)
 
+# Only the last OUTPUT_CAPTURE_BYTES of stdout and of stderr are kept
+OUTPUT_CAPTURE_BYTES = 64 * 1024
+OUTPUT_READ_CHUNK_BYTES = 8192
+# After a timeout kill, how long to keep draining output already in the pipes
+OUTPUT_DRAIN_AFTER_KILL_SEC = 1.0
+OUTPUT_TRUNCATED_MARKER = "[... earlier output truncated ...]\n"
 
-def _count_fds(pid: int) -> int:
-    """Return number of open FDs for a process."""
-    try:
-        return len(os.listdir(f"/proc/{pid}/fd"))
-    except (FileNotFoundError, PermissionError):
-        return -1
+# prlimit(1) applies RLIMIT_NOFILE and execs the command, so Popen needs no
+# preexec_fn and can spawn with vfork; resolved once, preexec_fn is the fallback
+_PRLIMIT = shutil.which("prlimit")
 
+# Successful C builds kept per source hash (LRU); failures are never cached
+COMPILE_CACHE_MAX_ENTRIES = 32
+HASH_READ_CHUNK_BYTES = 64 * 1024
 
-def _read_fds(pid: int) -> list[dict]:
-    """Read FD entries for a process. Returns list of {fd, target}."""
-    entries = []
-    path = f"/proc/{pid}/fd"
-    try:
-        for fd in os.listdir(path):
-            target = os.readlink(f"{path}/{fd}")
-            entries.append({"fd": int(fd), "target": target})
-    except (FileNotFoundError, PermissionError, OSError):
-        pass
-    return entries
+# source hash -> (binary path, SHA-256 of the binary at insert time)
+_compile_cache: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+_compile_cache_lock = threading.Lock()
+_compile_cache_root: Optional[str] = None
 
 
-def _fd_sampler(
-    pid: int,
-    fd_samples: list,
-    last_fd_snapshot: dict,
-    stop_event: threading.Event,
-) -> None:
+def _sample_fds(pid: int, prev_names: frozenset) -> tuple[Optional[frozenset], Optional[list[dict]]]:
     """
-    Background thread: poll FD count and snapshot until process exits.
+    One pass over /proc/{pid}/fd through a single open directory fd.
+    Returns (names, entries): names is None if the directory is unreadable;
+    entries is None when the FD set equals prev_names, so targets are not re-read.
+    Otherwise entries is a list of {fd, target}.
+    Raises FileNotFoundError once the process has exited.
+    """
+    try:
+        dir_fd = os.open(f"/proc/{pid}/fd", os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        return None, None
+    try:
+        listed = os.listdir(dir_fd)
+        names = frozenset(listed)
+        if names == prev_names:
+            return names, None
+        entries = []
+        try:
+            # readlinkat() relative to the open directory: no per-FD path resolution
+            for fd in listed:
+                entries.append({"fd": int(fd), "target": os.readlink(fd, dir_fd=dir_fd)})
+        except OSError:
+            pass
+        return names, entries
+    except FileNotFoundError:
+        raise
+    except OSError:
+        return None, None
+    finally:
+        os.close(dir_fd)
+
+
+class _SamplerHub:
+    """
+    One daemon thread sampling the FDs of every running sandbox, instead of a
+    sampler thread per execution. Each registered pid is sampled immediately,
+    then every FD_SAMPLE_INTERVAL_SEC, until it exits or is unregistered.
+    Samples go to the caller's two parallel lists (raw monotonic times, fd counts);
+    FD targets are only re-read when the set of open FD numbers changes.
     """
-    while not stop_event.is_set():
-        if not os.path.exists(f"/proc/{pid}"):
-            break
-        count = _count_fds(pid)
-        if count >= 0:
-            fd_samples.append({"time_sec": round(time.monotonic(), 3), "fd_count": count})
-            last_fd_snapshot["entries"] = _read_fds(pid)
-        time.sleep(FD_SAMPLE_INTERVAL_SEC)
-
 
-def execute_code_safely(
-    script_path: str,
-    timeout_sec: int = DEFAULT_TIMEOUT_SEC,
-    fd_limit: int = DEFAULT_FD_LIMIT,
-    python_executable: Optional[str] = None,
+    def __init__(self) -> None:
+        # Held while sampling a pid, so unregister() never returns mid-sample
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # pid -> [sample_times, sample_counts, last_fd_snapshot, prev_names, next_due]
+        # next_due is None once the process has exited
+        self._active: dict[int, list] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, pid: int, sample_times: list, sample_counts: list, last_fd_snapshot: dict) -> None:
+        with self._lock:
+            self._active[pid] = [sample_times, sample_counts, last_fd_snapshot, frozenset(), time.monotonic()]
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="fd-sampler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def unregister(self, pid: int) -> None:
+        with self._lock:
+            self._active.pop(pid, None)
+
+    def _sample(self, pid: int, state: list) -> None:
+        sample_times, sample_counts, last_fd_snapshot, prev_names, _ = state
+        try:
+            names, entries = _sample_fds(pid, prev_names)
+        except FileNotFoundError:
+            state[4] = None  # /proc/{pid} is gone: the process has exited
+            return
+        if names is not None:
+            sample_times.append(time.monotonic())
+            sample_counts.append(len(names))
+            if entries is not None:
+                last_fd_snapshot["entries"] = entries
+                state[3] = names
+        state[4] = time.monotonic() + FD_SAMPLE_INTERVAL_SEC
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                due_pids = [pid for pid, state in self._active.items()
+                            if state[4] is not None and state[4] <= time.monotonic()]
+            for pid in due_pids:
+                with self._lock:
+                    state = self._active.get(pid)
+                    if state is not None:
+                        try:
+                            self._sample(pid, state)
+                        except Exception:
+                            # Never let one pid kill the only sampler thread
+                            logger.exception("FD sampling failed pid=%s", pid)
+                            state[4] = None
+            with self._lock:
+                pending = [state[4] for state in self._active.values() if state[4] is not None]
+            # register() sets _wakeup, so a new pid gets its first sample right away
+            self._wakeup.wait(max(min(pending) - time.monotonic(), 0) if pending else None)
+
+
+_sampler_hub = _SamplerHub()
+
+
+def _drain_output(
+    sel: selectors.BaseSelector,
+    buffers: dict,
+    truncated: dict,
+    deadline: float,
+) -> bool:
+    """
+    Read registered streams into their bounded buffers until all reach EOF
+    or the monotonic deadline passes. Returns True if every stream closed.
+    """
+    while sel.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        for key, _ in sel.select(remaining):
+            chunk = os.read(key.fd, OUTPUT_READ_CHUNK_BYTES)
+            if not chunk:
+                sel.unregister(key.fileobj)
+                continue
+            buf = buffers[key.fileobj]
+            buf += chunk
+            if len(buf) > OUTPUT_CAPTURE_BYTES:
+                del buf[:-OUTPUT_CAPTURE_BYTES]
+                truncated[key.fileobj] = True
+    return True
+
+
+def _decode_output(buf: bytearray, was_truncated: bool) -> str:
+    text = buf.decode("utf-8", errors="replace") if buf else ""
+    return OUTPUT_TRUNCATED_MARKER + text if was_truncated else text
+
+
+def _run_sandboxed(
+    argv: list[str],
+    cwd: str,
+    timeout_sec: int,
+    fd_limit: int,
 ) -> dict:
     """
-    Execute a Python script safely with timeout and FD limits.
-    Samples FD count during execution and captures final FD snapshot.
+    Run argv in a new session with RLIMIT_NOFILE, FD sampling and a timeout.
+    stdout/stderr are read incrementally into bounded buffers rather than
+    buffered whole by communicate().
 
-    Returns a structured execution report:
-    - pid: process ID
-    - duration_seconds: wall-clock time
-    - termination_reason: "normal" | "timeout" | "error"
-    - exit_code: process exit code (or None if killed)
-    - stdout, stderr: captured output (always str)
-    - fd_samples: list of {time_sec, fd_count}
-    - fd_snapshot: list of {fd, target} at last sample
+    Returns the execution report described in execute_code_safely.
     """
-    if timeout_sec <= 0:
-        timeout_sec = DEFAULT_TIMEOUT_SEC
-    if fd_limit <= 0:
-        fd_limit = DEFAULT_FD_LIMIT
-
-    python = python_executable or "python3"
-    abs_script = os.path.abspath(script_path)
-    cwd = os.path.dirname(abs_script) or "."
-
     def set_limits():
         resource.setrlimit(resource.RLIMIT_NOFILE, (fd_limit, fd_limit))
 
-    fd_samples: list = []
+    preexec_fn = None
+    if _PRLIMIT:
+        argv = [_PRLIMIT, f"--nofile={fd_limit}:{fd_limit}", *argv]
+    elif os.name == "posix":
+        preexec_fn = set_limits
+
+    sample_times: list[float] = []
+    sample_counts: list[int] = []
     last_fd_snapshot: dict = {"entries": []}
-    stop_event = threading.Event()
 
     start = time.monotonic()
     sampling_started_at = datetime.now(timezone.utc).isoformat()
     proc = subprocess.Popen(
-        [python, abs_script],
+        argv,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        preexec_fn=set_limits if os.name == "posix" else None,
+        preexec_fn=preexec_fn,
         cwd=cwd,
         start_new_session=True,
     )
     pid = proc.pid
     logger.info(
         "Execution started pid=%s path=%s timeout=%s fd_limit=%s",
-        pid, abs_script, timeout_sec, fd_limit,
-    )
-
-    sampler = threading.Thread(
-        target=_fd_sampler,
-        args=(pid, fd_samples, last_fd_snapshot, stop_event),
-        daemon=True,
+        pid, argv[-1], timeout_sec, fd_limit,
     )
-    sampler.start()
 
-    termination_reason: str
-    exit_code: Optional[int]
-    stdout_bytes: bytes
-    stderr_bytes: bytes
+    _sampler_hub.register(pid, sample_times, sample_counts, last_fd_snapshot)
 
     try:
-        stdout_bytes, stderr_bytes = proc.communicate(timeout=timeout_sec)
-        exit_code = proc.returncode
-        termination_reason = "normal" if exit_code == 0 else "error"
-    except subprocess.TimeoutExpired:
-        logger.warning("Execution timeout pid=%s after %ss", pid, timeout_sec)
-        try:
-            os.killpg(os.getpgid(pid), signal.SIGKILL)
-        except (ProcessLookupError, OSError):
-            proc.kill()
-        proc.wait()
-        stdout_bytes = proc.stdout.read() if proc.stdout else b""
-        stderr_bytes = proc.stderr.read() if proc.stderr else b""
-        exit_code = None
-        termination_reason = "timeout"
-
-    stop_event.set()
-    sampler.join(timeout=1.0)
+        termination_reason: str
+        exit_code: Optional[int]
+        buffers = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+        truncated = {proc.stdout: False, proc.stderr: False}
+        deadline = start + timeout_sec
+
+        with selectors.DefaultSelector() as sel:
+            for stream in buffers:
+                sel.register(stream, selectors.EVENT_READ)
+            try:
+                if not _drain_output(sel, buffers, truncated, deadline):
+                    raise subprocess.TimeoutExpired(argv, timeout_sec)
+                # Both pipes closed; the process may still be running without output
+                exit_code = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+                termination_reason = "normal" if exit_code == 0 else "error"
+            except subprocess.TimeoutExpired:
+                logger.warning("Execution timeout pid=%s after %ss", pid, timeout_sec)
+                try:
+                    os.killpg(os.getpgid(pid), signal.SIGKILL)
+                except (ProcessLookupError, OSError):
+                    proc.kill()
+                proc.wait()
+                _drain_output(sel, buffers, truncated, time.monotonic() + OUTPUT_DRAIN_AFTER_KILL_SEC)
+                exit_code = None
+                termination_reason = "timeout"
+        proc.stdout.close()
+        proc.stderr.close()
+    finally:
+        _sampler_hub.unregister(pid)
+
     duration_seconds = round(time.monotonic() - start, 3)
 
-    stdout_str = stdout_bytes.decode("utf-8", errors="replace") if stdout_bytes else ""
-    stderr_str = stderr_bytes.decode("utf-8", errors="replace") if stderr_bytes else ""
+    stdout_str = _decode_output(buffers[proc.stdout], truncated[proc.stdout])
+    stderr_str = _decode_output(buffers[proc.stderr], truncated[proc.stderr])
 
-    combined_err = (stdout_str + stderr_str).lower()
-    if any(ind in combined_err for ind in FD_LIMIT_VIOLATION_INDICATORS):
+    if _FD_LIMIT_VIOLATION_RE.search(stderr_str) or _FD_LIMIT_VIOLATION_RE.search(stdout_str):
         logger.warning("FD limit violation detected pid=%s fd_limit=%s", pid, fd_limit)
 
     logger.info(
@@ -158,10 +278,10 @@ def execute_code_safely(
         pid, duration_seconds, termination_reason,
     )
 
-    t0 = fd_samples[0]["time_sec"] if fd_samples else 0
+    t0 = sample_times[0] if sample_times else 0
     normalized_samples = [
-        {"time_sec": round(s["time_sec"] - t0, 3), "fd_count": s["fd_count"]}
-        for s in fd_samples
+        {"time_sec": round(t - t0, 3), "fd_count": count}
+        for t, count in zip(sample_times, sample_counts)
     ]
     snapshot_taken_at = datetime.now(timezone.utc).isoformat()
 
@@ -181,6 +301,37 @@ def execute_code_safely(
     }
 
 
+def execute_code_safely(
+    script_path: str,
+    timeout_sec: int = DEFAULT_TIMEOUT_SEC,
+    fd_limit: int = DEFAULT_FD_LIMIT,
+    python_executable: Optional[str] = None,
+) -> dict:
+    """
+    Execute a Python script safely with timeout and FD limits.
+    Samples FD count during execution and captures final FD snapshot.
+
+    Returns a structured execution report:
+    - pid: process ID
+    - duration_seconds: wall-clock time
+    - termination_reason: "normal" | "timeout" | "error"
+    - exit_code: process exit code (or None if killed)
+    - stdout, stderr: captured output (always str; last OUTPUT_CAPTURE_BYTES of each)
+    - fd_samples: list of {time_sec, fd_count}
+    - fd_snapshot: list of {fd, target} at last sample
+    """
+    if timeout_sec <= 0:
+        timeout_sec = DEFAULT_TIMEOUT_SEC
+    if fd_limit <= 0:
+        fd_limit = DEFAULT_FD_LIMIT
+
+    python = python_executable or "python3"
+    abs_script = os.path.abspath(script_path)
+    cwd = os.path.dirname(abs_script) or "."
+
+    return _run_sandboxed([python, abs_script], cwd, timeout_sec, fd_limit)
+
+
 def compile_c(source_path: str, binary_name: str = "program") -> tuple[bool, str, str, Optional[str]]:
     """
     Compile a C source file using gcc.
@@ -205,14 +356,124 @@ def compile_c(source_path: str, binary_name: str = "program") -> tuple[bool, str
     return (success, stdout, stderr, binary_path if success else None)
 
 
+def _file_sha256(path: str) -> str:
+    # Chunked update loop rather than hashlib.file_digest(), which needs Python 3.11
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_READ_CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _remove_build_dir(build_dir: str) -> None:
+    """rmtree a cache build directory, restoring the write bit _seal_build_dir removed."""
+    try:
+        os.chmod(build_dir, 0o700)
+    except OSError:
+        pass
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def _seal_build_dir(build_dir: str, binary_path: str) -> None:
+    """Make a cached build read-only so sandboxed runs cannot replace or unlink it."""
+    os.chmod(binary_path, 0o555)
+    os.chmod(build_dir, 0o555)
+
+
+def _cached_binary_intact(binary_path: str, digest: str) -> bool:
+    """The sandbox can reach its own binary via /proc/self/exe: re-check it on every hit."""
+    try:
+        return os.path.isfile(binary_path) and _file_sha256(binary_path) == digest
+    except OSError:
+        return False
+
+
+def compile_c_cached(source: bytes, binary_name: str = "program") -> tuple[bool, str, str, Optional[str]]:
+    """
+    Compile C source bytes, reusing the binary of an identical earlier build.
+    Builds live in a private per-process directory keyed by the SHA-256 of the source,
+    sealed read-only; a hit whose binary is missing or modified is dropped and rebuilt.
+    The cached binary is shared: run it with its own cwd (execute_binary_safely(cwd=...)).
+
+    Returns the same tuple as compile_c; a cache hit has empty compiler output.
+    """
+    global _compile_cache_root
+    key = hashlib.sha256(source).hexdigest()
+    with _compile_cache_lock:
+        entry = _compile_cache.get(key)
+    if entry is not None:
+        binary_path, digest = entry
+        if _cached_binary_intact(binary_path, digest):
+            with _compile_cache_lock:
+                if key in _compile_cache:
+                    _compile_cache.move_to_end(key)
+            return (True, "", "", binary_path)
+        logger.warning("Cached binary %s is missing or modified; rebuilding", binary_path)
+        with _compile_cache_lock:
+            if _compile_cache.get(key) == entry:
+                del _compile_cache[key]
+        _remove_build_dir(os.path.dirname(binary_path))
+
+    with _compile_cache_lock:
+        if _compile_cache_root is None:
+            _compile_cache_root = tempfile.mkdtemp(prefix="fd-forensics-build-")
+        build_dir = tempfile.mkdtemp(prefix=key[:16] + "-", dir=_compile_cache_root)
+
+    source_path = os.path.join(build_dir, "main.c")
+    with open(source_path, "wb") as f:
+        f.write(source)
+    try:
+        success, stdout, stderr, binary_path = compile_c(source_path, binary_name)
+        if success:
+            digest = _file_sha256(binary_path)
+            _seal_build_dir(build_dir, binary_path)
+    except BaseException:
+        _remove_build_dir(build_dir)
+        raise
+    if not success:
+        _remove_build_dir(build_dir)
+        return (success, stdout, stderr, None)
+
+    evicted = []
+    with _compile_cache_lock:
+        if key in _compile_cache:
+            # A concurrent build of the same source finished first; keep that one
+            evicted.append(build_dir)
+            binary_path = _compile_cache[key][0]
+            _compile_cache.move_to_end(key)
+        else:
+            _compile_cache[key] = (binary_path, digest)
+            while len(_compile_cache) > COMPILE_CACHE_MAX_ENTRIES:
+                _, (old_path, _) = _compile_cache.popitem(last=False)
+                evicted.append(os.path.dirname(old_path))
+    for path in evicted:
+        _remove_build_dir(path)
+    return (True, stdout, stderr, binary_path)
+
+
+def clear_compile_cache() -> None:
+    """Remove every cached build and the cache root; call on server shutdown."""
+    global _compile_cache_root
+    with _compile_cache_lock:
+        build_dirs = [os.path.dirname(path) for path, _ in _compile_cache.values()]
+        _compile_cache.clear()
+        root, _compile_cache_root = _compile_cache_root, None
+    for build_dir in build_dirs:
+        _remove_build_dir(build_dir)
+    if root is not None:
+        shutil.rmtree(root, ignore_errors=True)
+
+
 def execute_binary_safely(
     binary_path: str,
     timeout_sec: int = DEFAULT_TIMEOUT_SEC,
     fd_limit: int = DEFAULT_FD_LIMIT,
+    cwd: Optional[str] = None,
 ) -> dict:
     """
     Execute a compiled binary safely with timeout and FD limits.
     Same sandbox as execute_code_safely: RLIMIT_NOFILE, FD sampling, killpg on timeout.
+    cwd defaults to the binary's directory.
 
     Returns the same structure as execute_code_safely.
     """
@@ -222,93 +483,6 @@ def execute_binary_safely(
         fd_limit = DEFAULT_FD_LIMIT
 
     abs_binary = os.path.abspath(binary_path)
-    cwd = os.path.dirname(abs_binary) or "."
-
-    def set_limits():
-        resource.setrlimit(resource.RLIMIT_NOFILE, (fd_limit, fd_limit))
-
-    fd_samples: list = []
-    last_fd_snapshot: dict = {"entries": []}
-    stop_event = threading.Event()
-
-    start = time.monotonic()
-    sampling_started_at = datetime.now(timezone.utc).isoformat()
-    proc = subprocess.Popen(
-        [abs_binary],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        preexec_fn=set_limits if os.name == "posix" else None,
-        cwd=cwd,
-        start_new_session=True,
-    )
-    pid = proc.pid
-    logger.info(
-        "Execution started pid=%s path=%s timeout=%s fd_limit=%s",
-        pid, abs_binary, timeout_sec, fd_limit,
-    )
-
-    sampler = threading.Thread(
-        target=_fd_sampler,
-        args=(pid, fd_samples, last_fd_snapshot, stop_event),
-        daemon=True,
-    )
-    sampler.start()
-
-    termination_reason: str
-    exit_code: Optional[int]
-    stdout_bytes: bytes
-    stderr_bytes: bytes
-
-    try:
-        stdout_bytes, stderr_bytes = proc.communicate(timeout=timeout_sec)
-        exit_code = proc.returncode
-        termination_reason = "normal" if exit_code == 0 else "error"
-    except subprocess.TimeoutExpired:
-        logger.warning("Execution timeout pid=%s after %ss", pid, timeout_sec)
-        try:
-            os.killpg(os.getpgid(pid), signal.SIGKILL)
-        except (ProcessLookupError, OSError):
-            proc.kill()
-        proc.wait()
-        stdout_bytes = proc.stdout.read() if proc.stdout else b""
-        stderr_bytes = proc.stderr.read() if proc.stderr else b""
-        exit_code = None
-        termination_reason = "timeout"
-
-    stop_event.set()
-    sampler.join(timeout=1.0)
-    duration_seconds = round(time.monotonic() - start, 3)
-
-    stdout_str = stdout_bytes.decode("utf-8", errors="replace") if stdout_bytes else ""
-    stderr_str = stderr_bytes.decode("utf-8", errors="replace") if stderr_bytes else ""
-
-    combined_err = (stdout_str + stderr_str).lower()
-    if any(ind in combined_err for ind in FD_LIMIT_VIOLATION_INDICATORS):
-        logger.warning("FD limit violation detected pid=%s fd_limit=%s", pid, fd_limit)
-
-    logger.info(
-        "Execution finished pid=%s duration=%.3fs reason=%s",
-        pid, duration_seconds, termination_reason,
-    )
-
-    t0 = fd_samples[0]["time_sec"] if fd_samples else 0
-    normalized_samples = [
-        {"time_sec": round(s["time_sec"] - t0, 3), "fd_count": s["fd_count"]}
-        for s in fd_samples
-    ]
-    snapshot_taken_at = datetime.now(timezone.utc).isoformat()
+    cwd = cwd or os.path.dirname(abs_binary) or "."
 
-    return {
-        "pid": pid,
-        "duration_seconds": duration_seconds,
-        "termination_reason": termination_reason,
-        "exit_code": exit_code,
-        "stdout": stdout_str,
-        "stderr": stderr_str,
-        "fd_samples": normalized_samples,
-        "fd_snapshot": last_fd_snapshot.get("entries", []),
-        "timeout_sec": timeout_sec,
-        "fd_limit": fd_limit,
-        "sampling_started_at": sampling_started_at,
-        "snapshot_taken_at": snapshot_taken_at,
-    }
+    return _run_sandboxed([abs_binary], cwd, timeout_sec, fd_limit)
@@ -3,11 +3,19 @@ FastAPI backend for File Descriptor Forensics and Code Sandbox.
 Exposes REST endpoints for process listing, FD analysis, and code execution analysis.
 """
 
+import asyncio
+import hashlib
 import logging
+import multiprocessing
 import os
 import shutil
 import sys
 import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
@@ -22,9 +30,11 @@ except ImportError:
     pass
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
+import orjson
 
 # Ensure project root is on path for proc/ and analysis/ imports
 if str(_root) not in sys.path:
@@ -38,9 +48,10 @@ from analysis.report_builder import analyze_fds
 from backend.analyzer.code_executor import (
     execute_code_safely,
     execute_binary_safely,
-    compile_c,
+    compile_c_cached,
+    clear_compile_cache,
 )
-from backend.ai.gemini_client import summarize_fd_report
+from backend.ai.gemini_client import GEMINI_REQUEST_TIMEOUT_SEC, summarize_fd_report
 from backend.pdf_report import generate_process_pdf, generate_code_pdf
 
 logger = logging.getLogger(__name__)
@@ -48,9 +59,18 @@ logger = logging.getLogger(__name__)
 # -----------------------------
 # APP
 # -----------------------------
+class _OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson (FastAPI's own ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = FastAPI(
     title="File Descriptor Forensics and Code Sandbox API",
     description="File descriptor forensics and code execution sandbox analysis",
+    # orjson encodes the large fd_samples / fd_snapshot lists much faster than json.dumps
+    default_response_class=_OrjsonResponse,
 )
 
 app.add_middleware(
@@ -72,6 +92,63 @@ def log_gemini_status():
         logger.info("Gemini AI disabled")
 
 
+# -----------------------------
+# PDF WORKERS
+# -----------------------------
+# ReportLab/matplotlib rendering is CPU-bound pure Python: run it in worker
+# processes so PDF requests neither block the event loop nor serialize on the GIL.
+PDF_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Create the PDF worker pool on first use (spawn: the server process has threads)."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_pdf_pool() call starts a fresh one."""
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _render_pdf(func, *args) -> bytes:
+    """
+    Run a pdf_report generator in the worker pool; args must be plain picklable data.
+    A worker dying (crash, OOM kill) breaks the whole pool: replace it and retry once.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        logger.warning("PDF worker pool broken; restarting it and retrying")
+        _discard_pdf_pool(pool)
+        return await loop.run_in_executor(_get_pdf_pool(), func, *args)
+
+
+@app.on_event("shutdown")
+def shutdown_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+@app.on_event("shutdown")
+def remove_compile_cache():
+    clear_compile_cache()
+
+
 # -----------------------------
 # RESPONSE SCHEMAS
 # -----------------------------
@@ -198,7 +275,7 @@ def get_process_analysis(pid: int):
     snapshot_taken_at = datetime.now(timezone.utc).isoformat()
 
     return ProcessAnalysisResponse(
-        table=[FDEntry(**r) for r in result["table"]],
+        table=_fd_table_rows(result["table_columns"]),
         type_counts=dict(result["type_counts"]),
         non_standard=result["non_standard"],
         severity=result["severity"],
@@ -214,14 +291,14 @@ def get_process_analysis(pid: int):
 
 
 @app.get("/process/{pid}/analysis/pdf")
-def get_process_analysis_pdf(pid: int):
+async def get_process_analysis_pdf(pid: int):
     """
     Generate and download PDF report for process FD analysis.
     Reuses same analysis data as GET /process/{pid}/analysis.
     """
     try:
-        fds = read_fds(pid)
-        soft, _hard = get_fd_limits(pid)
+        fds = await run_in_threadpool(read_fds, pid)
+        soft, _hard = await run_in_threadpool(get_fd_limits, pid)
         soft_limit = int(soft) if soft.isdigit() else None
     except Exception as e:
         raise HTTPException(
@@ -229,10 +306,11 @@ def get_process_analysis_pdf(pid: int):
             detail=f"Process {pid} not found or inaccessible: {str(e)}",
         )
 
-    result = analyze_fds(fds, soft_limit)
+    # Classifying every FD is O(N): keep it off the event loop
+    result = await run_in_threadpool(analyze_fds, fds, soft_limit)
     snapshot_taken_at = datetime.now(timezone.utc).isoformat()
     data = {
-        "table": result["table"],
+        "table_columns": result["table_columns"],
         "type_counts": dict(result["type_counts"]),
         "non_standard": result["non_standard"],
         "severity": result["severity"],
@@ -246,7 +324,7 @@ def get_process_analysis_pdf(pid: int):
         "snapshot_taken_at": snapshot_taken_at,
     }
 
-    pdf_bytes = generate_process_pdf(pid, data)
+    pdf_bytes = await _render_pdf(generate_process_pdf, pid, data)
     filename = f"fd-forensics-process-{pid}.pdf"
     return Response(
         content=pdf_bytes,
@@ -265,92 +343,12 @@ async def analyze_code(
     and return raw analysis plus AI summary from Gemini.
     Optional gemini_api_key from UI is used for AI summarization if provided.
     """
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No filename provided")
-    ext = file.filename.lower().endswith
-    if not (ext(".py") or ext(".c")):
-        raise HTTPException(status_code=400, detail="Only .py and .c files are accepted")
-
-    content = await file.read()
-    try:
-        decoded = content.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
-
-    is_python = file.filename.lower().endswith(".py")
-    language = "python" if is_python else "c"
-
-    if is_python:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(decoded)
-            tmp_path = f.name
-        tmp_dir = None
-        binary_path = None
-    else:
-        tmp_dir = tempfile.mkdtemp()
-        source_path = os.path.join(tmp_dir, "main.c")
-        with open(source_path, "w") as f:
-            f.write(decoded)
-        tmp_path = source_path
-        binary_path = os.path.join(tmp_dir, "program")
+    content = await _read_code_upload(file)
 
     try:
-        if is_python:
-            exec_report = execute_code_safely(tmp_path)
-            exec_report["language"] = "python"
-        else:
-            success, compile_stdout, compile_stderr, out_binary = compile_c(tmp_path, "program")
-            if not success:
-                exec_report = {
-                    "pid": None,
-                    "duration_seconds": 0.0,
-                    "termination_reason": "compile_error",
-                    "exit_code": None,
-                    "stdout": compile_stdout,
-                    "stderr": compile_stderr,
-                    "fd_samples": [],
-                    "fd_snapshot": [],
-                    "timeout_sec": 30,
-                    "fd_limit": 256,
-                }
-                exec_report["language"] = "c"
-            else:
-                exec_report = execute_binary_safely(out_binary)
-                exec_report["language"] = "c"
-
-        raw_analysis = _build_raw_analysis(exec_report)
-
-        api_key = (gemini_api_key or "").strip().replace("\r", "").replace("\n", "").strip() or None
-        key_was_provided = bool(api_key)
-        ai_summary: str
-        summary_text, error_code, error_detail = summarize_fd_report(raw_analysis, api_key=api_key)
-        if summary_text:
-            ai_summary = summary_text
-        elif not key_was_provided:
-            ai_summary = "Paste your Gemini API key above, then upload a file and run analysis again to get an AI forensic summary."
-        elif error_code == "invalid_key":
-            ai_summary = (
-                "Invalid API key. Get a valid key at Google AI Studio (aistudio.google.com/apikey), "
-                "paste it above (no extra spaces or newlines), and run analysis again."
-            )
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
-        elif error_code == "quota":
-            ai_summary = (
-                "Quota or rate limit exceeded. Wait a few minutes and try again, or check your plan and billing at Google AI Studio. "
-                "Details: https://ai.google.dev/gemini-api/docs/rate-limits"
-            )
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
-        elif error_code == "blocked":
-            ai_summary = error_detail or "Response was blocked by the model. Try again or use different code."
-        elif error_code == "network":
-            ai_summary = error_detail or "Network error. Check your connection and try again."
-        else:
-            ai_summary = "AI summarization failed. Check your API key at Google AI Studio and try again."
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
-
+        raw_analysis, ai_summary = await _run_code_pipeline(
+            content, file.filename, gemini_api_key, use_cached=False
+        )
         return CodeAnalysisResponse(
             raw_analysis=RawAnalysis(**raw_analysis),
             ai_summary=ai_summary,
@@ -360,17 +358,6 @@ async def analyze_code(
     except Exception as e:
         logger.exception("Code analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if is_python:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-        else:
-            try:
-                shutil.rmtree(tmp_dir, ignore_errors=True)
-            except OSError:
-                pass
 
 
 @app.post("/analyze/code/pdf")
@@ -380,9 +367,33 @@ async def analyze_code_pdf(
 ):
     """
     Upload a Python or C file, run analysis, and return PDF report.
-    Same execution and analysis as POST /analyze/code, but returns application/pdf.
+    Same execution and analysis as POST /analyze/code, but returns application/pdf;
+    a result that endpoint stored for the same file and key is reused.
     Optional gemini_api_key from UI is used for AI summarization if provided.
     """
+    content = await _read_code_upload(file)
+
+    try:
+        raw_analysis, ai_summary = await _run_code_pipeline(
+            content, file.filename, gemini_api_key, use_cached=True
+        )
+        pdf_bytes = await _render_pdf(generate_code_pdf, raw_analysis, ai_summary)
+        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+        filename = f"fd-forensics-code-{ts}.pdf"
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Code analysis PDF failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _read_code_upload(file: UploadFile) -> bytes:
+    """Validate an uploaded .py/.c file (name, extension, UTF-8) and return its bytes."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     ext = file.filename.lower().endswith
@@ -391,105 +402,202 @@ async def analyze_code_pdf(
 
     content = await file.read()
     try:
-        decoded = content.decode("utf-8")
+        content.decode("utf-8")  # validate only; the original bytes are what gets written
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    return content
+
+
+async def _run_code_pipeline(
+    content: bytes,
+    filename: str,
+    gemini_api_key: Optional[str],
+    use_cached: bool,
+) -> tuple[dict, str]:
+    """
+    Shared by /analyze/code and /analyze/code/pdf: execute, analyze and summarize an upload.
+    Returns (raw_analysis, ai_summary). Every run is stored in the result cache;
+    only use_cached callers (the PDF endpoint) are served from it.
+    """
+    is_python = filename.lower().endswith(".py")
+    api_key = (gemini_api_key or "").strip().replace("\r", "").replace("\n", "").strip() or None
+    result_key = _code_result_key(content, is_python, api_key)
+
+    async with _code_result_single_flight(result_key):
+        if use_cached:
+            cached = _code_result_get(result_key)
+            if cached is not None:
+                return cached
 
-    is_python = file.filename.lower().endswith(".py")
+        exec_report = await _execute_upload(content, is_python)
+        raw_analysis = _build_raw_analysis(exec_report)
 
-    if is_python:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(decoded)
-            tmp_path = f.name
-        tmp_dir = None
+        summary_text, error_code, error_detail = await _summarize(raw_analysis, api_key)
+        ai_summary = _ai_summary_message(summary_text, error_code, error_detail, bool(api_key))
+        # Gemini failures are not cached: "try again" must actually retry. error_code is
+        # None only for a summary or when no key is set (neither form nor .env)
+        if error_code is None:
+            _code_result_put(result_key, raw_analysis, ai_summary)
+        return raw_analysis, ai_summary
+
+
+def _ai_summary_message(
+    summary_text: Optional[str],
+    error_code: Optional[str],
+    error_detail: Optional[str],
+    key_was_provided: bool,
+) -> str:
+    """Return the Gemini summary, or the user-facing message for why there is none."""
+    if summary_text:
+        return summary_text
+    if not key_was_provided:
+        return "Paste your Gemini API key above, then upload a file and run analysis again to get an AI forensic summary."
+    if error_code == "invalid_key":
+        ai_summary = (
+            "Invalid API key. Get a valid key at Google AI Studio (aistudio.google.com/apikey), "
+            "paste it above (no extra spaces or newlines), and run analysis again."
+        )
+    elif error_code == "quota":
+        ai_summary = (
+            "Quota or rate limit exceeded. Wait a few minutes and try again, or check your plan and billing at Google AI Studio. "
+            "Details: https://ai.google.dev/gemini-api/docs/rate-limits"
+        )
+    elif error_code == "blocked":
+        return error_detail or "Response was blocked by the model. Try again or use different code."
+    elif error_code == "network":
+        return error_detail or "Network error. Check your connection and try again."
     else:
-        tmp_dir = tempfile.mkdtemp()
-        source_path = os.path.join(tmp_dir, "main.c")
-        with open(source_path, "w") as f:
-            f.write(decoded)
-        tmp_path = source_path
+        ai_summary = "AI summarization failed. Check your API key at Google AI Studio and try again."
+    if error_detail:
+        ai_summary = f"{error_detail}\n\n{ai_summary}"
+    return ai_summary
+
 
+# -----------------------------
+# CODE ANALYSIS RESULT CACHE
+# -----------------------------
+# /analyze/code stores (raw_analysis, ai_summary) per upload and API key, and
+# /analyze/code/pdf reuses it, so fetching the PDF after the JSON view does not re-run the code.
+CODE_RESULT_CACHE_TTL_SEC = 120.0
+CODE_RESULT_CACHE_MAX_ENTRIES = 64
+
+# Only touched from the event loop thread, so no locking beyond the per-key single flight
+_code_result_cache: "OrderedDict[str, tuple[float, dict, str]]" = OrderedDict()
+# key -> [lock, number of requests holding or waiting for it]
+_code_result_locks: dict[str, list] = {}
+
+
+def _code_result_key(content: bytes, is_python: bool, api_key: Optional[str]) -> str:
+    """Hash of language, API key (the summary depends on it) and file content."""
+    h = hashlib.sha256(b"py\0" if is_python else b"c\0")
+    h.update((api_key or "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(content)
+    return h.hexdigest()
+
+
+def _code_result_get(key: str) -> Optional[tuple[dict, str]]:
+    entry = _code_result_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, raw_analysis, ai_summary = entry
+    if time.monotonic() - stored_at > CODE_RESULT_CACHE_TTL_SEC:
+        del _code_result_cache[key]
+        return None
+    return raw_analysis, ai_summary
+
+
+def _code_result_put(key: str, raw_analysis: dict, ai_summary: str) -> None:
+    _code_result_cache[key] = (time.monotonic(), raw_analysis, ai_summary)
+    _code_result_cache.move_to_end(key)
+    while len(_code_result_cache) > CODE_RESULT_CACHE_MAX_ENTRIES:
+        _code_result_cache.popitem(last=False)
+
+
+@asynccontextmanager
+async def _code_result_single_flight(key: str):
+    """Serialize requests for the same key: a PDF request waits for an identical run in flight, then reuses it."""
+    entry = _code_result_locks.get(key)
+    if entry is None:
+        entry = _code_result_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
     try:
-        if is_python:
-            exec_report = execute_code_safely(tmp_path)
-            exec_report["language"] = "python"
-        else:
-            success, compile_stdout, compile_stderr, out_binary = compile_c(tmp_path, "program")
-            if not success:
-                exec_report = {
-                    "pid": None,
-                    "duration_seconds": 0.0,
-                    "termination_reason": "compile_error",
-                    "exit_code": None,
-                    "stdout": compile_stdout,
-                    "stderr": compile_stderr,
-                    "fd_samples": [],
-                    "fd_snapshot": [],
-                    "timeout_sec": 30,
-                    "fd_limit": 256,
-                }
-                exec_report["language"] = "c"
-            else:
-                exec_report = execute_binary_safely(out_binary)
-                exec_report["language"] = "c"
+        async with entry[0]:
+            yield
+    finally:
+        # Only the last holder/waiter drops the lock; queued requests keep using it
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _code_result_locks[key]
 
-        raw_analysis = _build_raw_analysis(exec_report)
 
-        api_key = (gemini_api_key or "").strip().replace("\r", "").replace("\n", "").strip() or None
-        key_was_provided = bool(api_key)
-        ai_summary: str
-        summary_text, error_code, error_detail = summarize_fd_report(raw_analysis, api_key=api_key)
-        if summary_text:
-            ai_summary = summary_text
-        elif not key_was_provided:
-            ai_summary = "Paste your Gemini API key above, then upload a file and run analysis again to get an AI forensic summary."
-        elif error_code == "invalid_key":
-            ai_summary = (
-                "Invalid API key. Get a valid key at Google AI Studio (aistudio.google.com/apikey), "
-                "paste it above (no extra spaces or newlines), and run analysis again."
-            )
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
-        elif error_code == "quota":
-            ai_summary = (
-                "Quota or rate limit exceeded. Wait a few minutes and try again, or check your plan and billing at Google AI Studio. "
-                "Details: https://ai.google.dev/gemini-api/docs/rate-limits"
-            )
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
-        elif error_code == "blocked":
-            ai_summary = error_detail or "Response was blocked by the model. Try again or use different code."
-        elif error_code == "network":
-            ai_summary = error_detail or "Network error. Check your connection and try again."
-        else:
-            ai_summary = "AI summarization failed. Check your API key at Google AI Studio and try again."
-            if error_detail:
-                ai_summary = f"{error_detail}\n\n{ai_summary}"
+# -----------------------------
+# GEMINI CALLS
+# -----------------------------
+# summarize_fd_report is a blocking SDK call: run it off the event loop. The SDK request
+# itself is bounded by GEMINI_REQUEST_TIMEOUT_SEC and gemini_client's circuit breaker
+# skips Gemini after repeated network failures; this wait is only a backstop.
+GEMINI_TIMEOUT_SEC = GEMINI_REQUEST_TIMEOUT_SEC + 5.0
 
-        pdf_bytes = generate_code_pdf(raw_analysis, ai_summary)
-        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-        filename = f"fd-forensics-code-{ts}.pdf"
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+
+async def _summarize(raw_analysis: dict, api_key: Optional[str]) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """summarize_fd_report off the event loop with a backstop timeout; same (summary, error_code, detail) result."""
+    try:
+        return await asyncio.wait_for(
+            run_in_threadpool(summarize_fd_report, raw_analysis, api_key=api_key),
+            timeout=GEMINI_TIMEOUT_SEC,
         )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception("Code analysis PDF failed")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
+    except asyncio.TimeoutError:
+        return (None, "network", f"Gemini did not respond within {GEMINI_TIMEOUT_SEC:g}s.")
+
+
+async def _execute_upload(content: bytes, is_python: bool) -> dict:
+    """
+    Run an uploaded .py or .c file in the sandbox and return its execution report.
+    C sources go through the content-hash compile cache; every run gets its own
+    scratch directory as cwd, removed afterwards.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    try:
         if is_python:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+            script_path = os.path.join(tmp_dir, "main.py")
+            with open(script_path, "wb") as f:
+                f.write(content)
+            exec_report = await run_in_threadpool(execute_code_safely, script_path)
+            exec_report["language"] = "python"
+            return exec_report
+
+        success, compile_stdout, compile_stderr, out_binary = await run_in_threadpool(compile_c_cached, content)
+        if not success:
+            exec_report = {
+                "pid": None,
+                "duration_seconds": 0.0,
+                "termination_reason": "compile_error",
+                "exit_code": None,
+                "stdout": compile_stdout,
+                "stderr": compile_stderr,
+                "fd_samples": [],
+                "fd_snapshot": [],
+                "timeout_sec": 30,
+                "fd_limit": 256,
+            }
         else:
-            try:
-                shutil.rmtree(tmp_dir, ignore_errors=True)
-            except OSError:
-                pass
+            exec_report = await run_in_threadpool(execute_binary_safely, out_binary, cwd=tmp_dir)
+        exec_report["language"] = "c"
+        return exec_report
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _fd_table_rows(table_columns: dict) -> list[dict]:
+    """
+    {FD, Target, Type} row dicts for the API's "table" fields, built from
+    analyze_fds()'s columnar table only where a response needs rows.
+    """
+    return [
+        {"FD": fd, "Target": target, "Type": fd_type}
+        for fd, target, fd_type in zip(table_columns["FD"], table_columns["Target"], table_columns["Type"])
+    ]
 
 
 def _build_raw_analysis(exec_report: dict) -> dict:
@@ -524,7 +632,7 @@ def _build_raw_analysis(exec_report: dict) -> dict:
         soft_limit = int(fd_limit) if fd_limit is not None else None
         analysis = analyze_fds(fd_snapshot, soft_limit)
         out["fd_analysis"] = {
-            "table": analysis["table"],
+            "table": _fd_table_rows(analysis["table_columns"]),
             "type_counts": dict(analysis["type_counts"]),
             "non_standard": analysis["non_standard"],
             "severity": analysis["severity"],
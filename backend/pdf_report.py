@@ -3,8 +3,11 @@ PDF report generation for File Descriptor Forensics and Code Sandbox.
 Produces readable text/tables and pie chart for FD type breakdown.
 """
 
+import re
+from collections import Counter
 from datetime import datetime
 from io import BytesIO
+from operator import itemgetter
 from typing import Any, Optional
 
 from reportlab.lib.pagesizes import A4
@@ -30,6 +33,37 @@ _TYPE_COLORS = {
     "Socket": "#dc2626",
 }
 
+# Shared styles, built once per process instead of per report
+_STYLES = getSampleStyleSheet()
+_SMALL_STYLE = ParagraphStyle(name="Small", parent=_STYLES["Normal"], fontSize=8)
+_METRICS_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+])
+_FD_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+])
+FD_TABLE_ROWS_PER_PAGE = 25
+# Above MAX_FD_TABLE_ROWS descriptors the PDF lists the most common targets instead
+# of every row (thousands of pages nobody reads)
+MAX_FD_TABLE_ROWS = 500
+FD_TABLE_TOP_TARGETS = 20
+
+# "## Heading" / "### Heading" lines of the AI summary; group 1 is the heading text
+_HEADING_RE = re.compile(r"#{2,3}\s*(.*)")
+
+# stdout/stderr shown in the code report; capture upstream already keeps only
+# the last OUTPUT_CAPTURE_BYTES (code_executor), so this only bounds the PDF
+PDF_OUTPUT_MAX_CHARS = 2000
+
+# Escape text for Paragraph markup in one pass; the _BR variant also turns newlines into breaks
+_HTML_TRANS = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_HTML_BR_TRANS = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "<br/>"})
+
 
 def _make_pie_chart_image(type_counts: dict) -> Optional[BytesIO]:
     """Generate a pie chart PNG as BytesIO. Returns None if no data."""
@@ -76,6 +110,72 @@ def _to_str(x: Any) -> str:
     return str(x)
 
 
+def _fmt_density(x: Any) -> str:
+    """fd_density to two decimals; one lookup and one format per call."""
+    return f"{x:.2f}" if isinstance(x, (int, float)) else _to_str(x)
+
+
+# fd_growth samples always carry fd_count ({time_sec, fd_count} from code_executor)
+_get_fd_count = itemgetter("fd_count")
+
+# Row dicts as produced by the API's "table" fields (backend.api._fd_table_rows)
+_fd_row_values = itemgetter("FD", "Target", "Type")
+
+
+def _fd_table_columns(data: dict) -> tuple:
+    """
+    (fds, targets, types) for the FD table: analyze_fds()'s columnar
+    "table_columns" when the caller passed it, else unzipped from "table" rows.
+    """
+    columns = data.get("table_columns")
+    if columns:
+        return columns["FD"], columns["Target"], columns["Type"]
+    return tuple(zip(*map(_fd_row_values, data.get("table") or []))) or ((), (), ())
+
+
+def _fd_summary_flowables(targets, types) -> list:
+    """Most common FD targets, for tables over MAX_FD_TABLE_ROWS; sockets and pipes grouped by kind."""
+    counts = Counter(
+        (f"{target.partition(':')[0]}:[…]" if typ in ("Socket", "Pipe") else target, typ)
+        for target, typ in zip(targets, types)
+    ).most_common(FD_TABLE_TOP_TARGETS)
+    tbl_rows = [["Target", "Type", "FDs"]]
+    tbl_rows += [[(target or "—")[:80], typ or "—", str(n)] for (target, typ), n in counts]
+    t = Table(tbl_rows, colWidths=[4 * inch, 1 * inch, 0.6 * inch])
+    t.setStyle(_FD_TABLE_STYLE)
+    note = Paragraph(
+        f"{len(targets)} descriptors exceed the {MAX_FD_TABLE_ROWS}-row table limit; "
+        f"showing the {len(counts)} most common targets.",
+        _STYLES["Normal"],
+    )
+    return [note, Spacer(1, 0.1 * inch), t]
+
+
+def _fd_table_flowables(fds, targets, types) -> list:
+    """
+    FD table split into FD_TABLE_ROWS_PER_PAGE-row tables separated by page breaks,
+    or a most-common-targets summary above MAX_FD_TABLE_ROWS descriptors.
+    """
+    if len(fds) > MAX_FD_TABLE_ROWS:
+        return _fd_summary_flowables(targets, types)
+    to_str = _to_str
+    # Every row projected in one comprehension, then sliced per page
+    rows = [
+        [to_str(fd), (target or "—")[:80], typ or "—"]
+        for fd, target, typ in zip(fds, targets, types)
+    ]
+    flowables = []
+    for i in range(0, len(rows), FD_TABLE_ROWS_PER_PAGE):
+        tbl_rows = [["FD", "Target", "Type"]]
+        tbl_rows += rows[i : i + FD_TABLE_ROWS_PER_PAGE]
+        t = Table(tbl_rows, colWidths=[0.6 * inch, 4 * inch, 1 * inch])
+        t.setStyle(_FD_TABLE_STYLE)
+        flowables.append(t)
+        if i + FD_TABLE_ROWS_PER_PAGE < len(rows):
+            flowables.append(PageBreak())
+    return flowables
+
+
 def _build_process_report(
     buffer: BytesIO,
     pid: int,
@@ -83,7 +183,7 @@ def _build_process_report(
 ) -> None:
     """Build PDF for live process analysis."""
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
-    styles = getSampleStyleSheet()
+    styles = _STYLES
     story = []
 
     story.append(Paragraph("File Descriptor Forensics and Code Sandbox", styles["Title"]))
@@ -95,17 +195,18 @@ def _build_process_report(
 
     # Metrics
     story.append(Paragraph("Metrics", styles["Heading3"]))
-    total = len(data.get("table", []) or [])
+    fds, targets, types = _fd_table_columns(data)
+    total = len(fds)
     metrics_data = [
         ["Total FDs", _to_str(total)],
         ["Non-Standard", _to_str(data.get("non_standard"))],
-        ["FD Density", _to_str(f"{data.get('fd_density', 0):.2f}" if isinstance(data.get("fd_density"), (int, float)) else data.get("fd_density"))],
+        ["FD Density", _fmt_density(data.get("fd_density"))],
         ["Severity", _to_str(data.get("severity"))],
     ]
     if data.get("usage_pct") is not None:
         metrics_data.append(["Usage vs Limit", f"{data['usage_pct']:.1f}%"])
     t = Table(metrics_data, colWidths=[2 * inch, 2 * inch])
-    t.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey), ("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+    t.setStyle(_METRICS_STYLE)
     story.append(t)
     story.append(Spacer(1, 0.2 * inch))
 
@@ -115,8 +216,9 @@ def _build_process_report(
     # Interpretation
     if data.get("analysis"):
         story.append(Paragraph("Forensic Interpretation", styles["Heading3"]))
-        for line in data["analysis"]:
-            story.append(Paragraph(f"• {line}", styles["Normal"]))
+        # One Paragraph for the whole list: a single Platypus layout pass
+        bullets = "<br/>".join(f"• {line.translate(_HTML_TRANS)}" for line in data["analysis"])
+        story.append(Paragraph(bullets, styles["Normal"]))
         story.append(Spacer(1, 0.2 * inch))
 
     # Type breakdown
@@ -135,29 +237,9 @@ def _build_process_report(
         story.append(Spacer(1, 0.2 * inch))
 
     # FD table (paginated)
-    table_data = data.get("table") or []
-    if table_data:
+    if fds:
         story.append(Paragraph("File Descriptor Table", styles["Heading3"]))
-        rows_per_page = 25
-        for i in range(0, len(table_data), rows_per_page):
-            chunk = table_data[i : i + rows_per_page]
-            tbl_rows = [["FD", "Target", "Type"]]
-            for row in chunk:
-                fd = row.get("FD", row.get("fd", ""))
-                target = row.get("Target", row.get("target", "")) or "—"
-                typ = row.get("Type", row.get("type", "")) or "—"
-                tbl_rows.append([_to_str(fd), str(target)[:80], _to_str(typ)])
-            t = Table(tbl_rows, colWidths=[0.6 * inch, 4 * inch, 1 * inch])
-            t.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]))
-            story.append(t)
-            if i + rows_per_page < len(table_data):
-                story.append(PageBreak())
+        story.extend(_fd_table_flowables(fds, targets, types))
 
     doc.build(story)
 
@@ -169,7 +251,7 @@ def _build_code_report(
 ) -> None:
     """Build PDF for code analysis run."""
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
-    styles = getSampleStyleSheet()
+    styles = _STYLES
     story = []
 
     story.append(Paragraph("File Descriptor Forensics and Code Sandbox", styles["Title"]))
@@ -193,17 +275,17 @@ def _build_code_report(
     if exec_meta.get("snapshot_taken_at"):
         exec_rows.append(["Snapshot taken (UTC)", exec_meta["snapshot_taken_at"]])
     t = Table(exec_rows, colWidths=[1.5 * inch, 2 * inch])
-    t.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey), ("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+    t.setStyle(_METRICS_STYLE)
     story.append(t)
 
     if exec_meta.get("stdout"):
         story.append(Spacer(1, 0.1 * inch))
         story.append(Paragraph("stdout:", styles["Normal"]))
-        story.append(Paragraph(exec_meta["stdout"][:2000].replace("\n", "<br/>"), ParagraphStyle(name="Small", parent=styles["Normal"], fontSize=8)))
+        story.append(Paragraph(exec_meta["stdout"][:PDF_OUTPUT_MAX_CHARS].translate(_HTML_BR_TRANS), _SMALL_STYLE))
     if exec_meta.get("stderr"):
         story.append(Spacer(1, 0.1 * inch))
         story.append(Paragraph("stderr:", styles["Normal"]))
-        story.append(Paragraph(exec_meta["stderr"][:2000].replace("\n", "<br/>"), ParagraphStyle(name="Small", parent=styles["Normal"], fontSize=8)))
+        story.append(Paragraph(exec_meta["stderr"][:PDF_OUTPUT_MAX_CHARS].translate(_HTML_BR_TRANS), _SMALL_STYLE))
 
     story.append(Spacer(1, 0.3 * inch))
 
@@ -212,9 +294,9 @@ def _build_code_report(
     if fd_growth:
         story.append(Paragraph("FD Growth", styles["Heading3"]))
         n = len(fd_growth)
-        t0 = fd_growth[0].get("time_sec", 0) if fd_growth else 0
-        t1 = fd_growth[-1].get("time_sec", 0) if fd_growth else 0
-        max_count = max((p.get("fd_count", 0) for p in fd_growth), default=0)
+        t0 = fd_growth[0].get("time_sec", 0)
+        t1 = fd_growth[-1].get("time_sec", 0)
+        max_count = max(map(_get_fd_count, fd_growth))
         story.append(Paragraph(
             f"Sample count: {n}; time range: {t0}–{t1} s; max FD count: {max_count}",
             styles["Normal"],
@@ -229,51 +311,38 @@ def _build_code_report(
             ["Total FDs", _to_str(len(fd_analysis.get("table") or []))],
             ["Non-Standard", _to_str(fd_analysis.get("non_standard"))],
             ["Severity", _to_str(fd_analysis.get("severity"))],
-            ["FD Density", _to_str(f"{fd_analysis.get('fd_density', 0):.2f}" if isinstance(fd_analysis.get("fd_density"), (int, float)) else fd_analysis.get("fd_density"))],
+            ["FD Density", _fmt_density(fd_analysis.get("fd_density"))],
         ]
         t = Table(metrics_rows, colWidths=[1.5 * inch, 2 * inch])
-        t.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey), ("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+        t.setStyle(_METRICS_STYLE)
         story.append(t)
         story.append(Spacer(1, 0.2 * inch))
 
         table_data = fd_analysis.get("table") or []
         if table_data:
             story.append(Paragraph("File Descriptor Table", styles["Heading3"]))
-            rows_per_page = 25
-            for i in range(0, len(table_data), rows_per_page):
-                chunk = table_data[i : i + rows_per_page]
-                tbl_rows = [["FD", "Target", "Type"]]
-                for row in chunk:
-                    fd = row.get("FD", row.get("fd", ""))
-                    target = row.get("Target", row.get("target", "")) or "—"
-                    typ = row.get("Type", row.get("type", "")) or "—"
-                    tbl_rows.append([_to_str(fd), str(target)[:80], _to_str(typ)])
-                t = Table(tbl_rows, colWidths=[0.6 * inch, 4 * inch, 1 * inch])
-                t.setStyle(TableStyle([
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]))
-                story.append(t)
-                if i + rows_per_page < len(table_data):
-                    story.append(PageBreak())
+            story.extend(_fd_table_flowables(*_fd_table_columns(fd_analysis)))
         story.append(Spacer(1, 0.3 * inch))
 
     # AI forensic summary
     if ai_summary:
         story.append(Paragraph("AI Forensic Summary", styles["Heading3"]))
-        for line in ai_summary.split("\n"):
+        # Consecutive body lines are joined into one Paragraph per section
+        body: list[str] = []
+        for line in ai_summary.splitlines():
             line = line.strip()
             if not line:
                 continue
-            if line.startswith("###"):
-                story.append(Paragraph(line[3:].strip(), styles["Heading4"]))
-            elif line.startswith("##"):
-                story.append(Paragraph(line[2:].strip(), styles["Heading4"]))
+            m = _HEADING_RE.match(line)
+            if m:
+                if body:
+                    story.append(Paragraph("<br/>".join(body), styles["Normal"]))
+                    body = []
+                story.append(Paragraph(m.group(1).translate(_HTML_TRANS), styles["Heading4"]))
             else:
-                story.append(Paragraph(line.replace("<", "&lt;").replace(">", "&gt;"), styles["Normal"]))
+                body.append(line.translate(_HTML_TRANS))
+        if body:
+            story.append(Paragraph("<br/>".join(body), styles["Normal"]))
         story.append(Spacer(1, 0.2 * inch))
 
     doc.build(story)
@@ -1,17 +1,29 @@
 import os
 
 def read_fds(pid):
-    entries = []
     path = f"/proc/{pid}/fd"
 
     try:
-        for fd in os.listdir(path):
-            target = os.readlink(f"{path}/{fd}")
-            entries.append({
-                "fd": int(fd),
-                "target": target
-            })
+        # readlinkat() relative to the open fd directory, so the kernel
+        # does not re-resolve /proc/<pid>/fd for every descriptor
+        dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except Exception:
+        return []
+
+    names = []
+    targets = []
+    try:
+        # List through the same open directory: no second path lookup
+        names = os.listdir(dir_fd)
+        # Syscall-only loop; int conversion and dict building happen afterwards.
+        # If a readlink fails, the targets read so far are kept.
+        readlink = os.readlink
+        append = targets.append
+        for fd in names:
+            append(readlink(fd, dir_fd=dir_fd))
     except Exception:
         pass
+    finally:
+        os.close(dir_fd)
 
-    return entries
+    return [{"fd": int(fd), "target": target} for fd, target in zip(names, targets)]
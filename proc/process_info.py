@@ -2,12 +2,15 @@ def get_fd_limits(pid):
     soft = hard = "N/A"
 
     try:
-        with open(f"/proc/{pid}/limits") as f:
-            for line in f:
-                if "Max open files" in line:
-                    parts = line.split()
-                    soft = parts[3]
-                    hard = parts[4]
+        # One read and one bytes.find instead of decoding and scanning every line
+        with open(f"/proc/{pid}/limits", "rb") as f:
+            data = f.read()
+        idx = data.find(b"Max open files")
+        if idx >= 0:
+            end = data.find(b"\n", idx)
+            parts = data[idx:end if end >= 0 else None].split()
+            soft = parts[3].decode()
+            hard = parts[4].decode()
     except Exception:
         pass
 